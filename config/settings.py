@@ -23,3 +23,6 @@ MYSQL_CONFIG = {
 GOOGLE_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 BQ_PROJECT_ID = os.getenv("BQ_PROJECT_ID")
 BQ_DATASET = os.getenv("BQ_DATASET")
+
+KEY_REGISTRY_DIR = os.getenv("KEY_REGISTRY_DIR", "key_registry")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
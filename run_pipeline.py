@@ -1,6 +1,8 @@
 
 import os
+import uuid
 import pandas as pd
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 from google.cloud import bigquery
 
@@ -17,6 +19,9 @@ from src.dimensional import (
     validate_referential_integrity,
 )
 from src.load import load_to_bigquery
+from src.keys import KeyRegistry, assert_unique_keys
+from src.profiling import ProfileStore, run_profiling
+from config.settings import KEY_REGISTRY_DIR, PROFILE_DIR
 
 # Load environment variables (GOOGLE_APPLICATION_CREDENTIALS, PROJECT_ID, DATASET_ID)
 load_dotenv()
@@ -28,6 +33,8 @@ DATASET_ID = os.getenv("BQ_DATASET")
 
 def main():
     extractor = DataExtractor()
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    profile_store = ProfileStore(PROFILE_DIR)
 
     print("\n======================")
     print("🔍 Phase 2: Extraction")
@@ -45,8 +52,20 @@ def main():
     transaction_b = extractor.extract_transactions("hospital_b")
     unified_transactions = extractor.unify_transactions(transaction_a, transaction_b)
 
+    unified_providers = pd.concat(
+        [extractor.extract_providers("hospital_a"), extractor.extract_providers("hospital_b")],
+        ignore_index=True,
+    )
+
     claims_df = extractor.extract_claims_csv("Data/claims")
 
+    print("\n📊 Profiling extracted data...")
+    run_profiling({
+        "extracted_patients": unified_patients,
+        "extracted_transactions": unified_transactions,
+        "extracted_claims": claims_df,
+    }, run_id, profile_store)
+
     print("\n============================")
     print("🧽 Phase 3: Transformation")
     print("============================")
@@ -54,11 +73,17 @@ def main():
     clean_patients = transform_patients(unified_patients)
     clean_transactions = transform_transactions(unified_transactions)
 
+    print("\n📊 Profiling transformed data...")
+    run_profiling({
+        "clean_patients": clean_patients,
+        "clean_transactions": clean_transactions,
+    }, run_id, profile_store)
+
     print("\n============================")
     print("📐 Phase 4: Dimensional Modeling")
     print("============================")
 
-    dim_providers = create_dim_providers(clean_transactions)
+    dim_providers = create_dim_providers(unified_providers, clean_transactions)
     dim_procedures = create_dim_procedures(clean_transactions)
     dim_date = create_dim_date(clean_transactions, date_columns=["VisitDate", "ServiceDate", "PaidDate"])
 
@@ -88,6 +113,22 @@ def main():
     validate_referential_integrity(fact_transactions, updated_dim_patients, dim_providers, dim_procedures, dim_date)
     validate_referential_integrity(fact_claims, updated_dim_patients, None, None, dim_date)
 
+    assert_unique_keys(updated_dim_patients, "patient_sk", "dim_patients")
+    assert_unique_keys(dim_providers, "provider_sk", "dim_providers")
+    assert_unique_keys(dim_procedures, "procedure_sk", "dim_procedures")
+    assert_unique_keys(clean_transactions, "TransactionKey", "transactions")
+    assert_unique_keys(fact_claims, "claim_sk", "fact_claims")
+
+    print("\n🔑 Registering surrogate keys...")
+    key_registry = KeyRegistry(KEY_REGISTRY_DIR)
+    # Unique per writer so runs or partitions starting in the same second never share a segment
+    key_segment = f"{run_id}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    key_registry.register("patient", updated_dim_patients, "patient_sk", ["unified_patient_id", "version"], segment=key_segment)
+    key_registry.register("provider", dim_providers, "provider_sk", ["source", "ProviderID"], segment=key_segment)
+    key_registry.register("procedure", dim_procedures, "procedure_sk", ["ProcedureCode"], segment=key_segment)
+    key_registry.register("transaction", clean_transactions, "TransactionKey", ["source", "TransactionID"], segment=key_segment)
+    key_registry.register("claim", fact_claims, "claim_sk", ["source", "ClaimID"], segment=key_segment)
+
     print("\n🚀 Phase 6: Loading to BigQuery")
     print("===============================")
 
@@ -2,9 +2,9 @@
 
 import pandas as pd
 import re
-import uuid
 from datetime import datetime
 from src.logger import get_logger
+from src.keys import surrogate_keys
 
 logger = get_logger("DataTransformer")
 
@@ -95,7 +95,8 @@ def standardize_procedure_codes(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def generate_transaction_keys(df):
-    df["TransactionKey"] = [str(uuid.uuid4()) for _ in range(len(df))]
+    # TransactionIDs repeat across hospitals, so the source is part of the natural key
+    df["TransactionKey"] = surrogate_keys(df, ["source", "TransactionID"], "transaction")
     return df
 
 # Optional: Wrapper functions
@@ -2,6 +2,7 @@
 
 import pandas as pd
 from datetime import datetime
+from src.keys import surrogate_keys
 
 # -----------------------------
 # DIMENSION TABLES
@@ -10,15 +11,30 @@ from datetime import datetime
 def create_dim_patients(patients_df):
     dim_patients = patients_df.copy()
     dim_patients = dim_patients.reset_index(drop=True)
-    dim_patients["patient_sk"] = dim_patients.index + 1  # surrogate key
+    # Same natural key as apply_scd_type_2; a fresh dimension is version 1
+    dim_patients["version"] = 1
+    dim_patients["patient_sk"] = surrogate_keys(dim_patients, ["unified_patient_id", "version"], "patient")
     return dim_patients[["patient_sk", "unified_patient_id", "FirstName", "LastName", "MiddleName",
-                         "Gender", "DOB", "SSN", "PhoneNumber", "Address", "source"]]
-
-def create_dim_providers(transactions_df):
-    dim_providers = transactions_df[["ProviderID"]].drop_duplicates().copy()
-    dim_providers = dim_providers.reset_index(drop=True)
-    dim_providers["provider_sk"] = dim_providers.index + 1
-    return dim_providers[["provider_sk", "ProviderID"]]
+                         "Gender", "DOB", "SSN", "PhoneNumber", "Address", "source", "version"]]
+
+PROVIDER_ATTRIBUTES = ["ProviderFirstName", "ProviderLastName", "Specialization", "NPI", "DeptID", "DepartmentName"]
+
+def create_dim_providers(providers_df, transactions_df):
+    # ProviderIDs repeat across hospitals, so providers are keyed per source.
+    # Attributes come from the pushed-down providers/departments query; IDs that
+    # only appear in transactions are kept with empty attributes so facts resolve.
+    keys = ["source", "ProviderID"]
+    dim_providers = providers_df[keys + PROVIDER_ATTRIBUTES].drop_duplicates(subset=keys)
+    seen = transactions_df[keys].drop_duplicates()
+    unmatched = seen.merge(dim_providers[keys], on=keys, how="left", indicator=True)
+    unmatched = unmatched[unmatched["_merge"] == "left_only"][keys]
+    if not unmatched.empty:
+        print(f"⚠️ {len(unmatched)} transaction ProviderIDs not found in providers tables")
+
+    dim_providers = pd.concat([dim_providers, unmatched], ignore_index=True)
+    dim_providers["NPI"] = pd.to_numeric(dim_providers["NPI"], errors="coerce").astype("Int64")
+    dim_providers["provider_sk"] = surrogate_keys(dim_providers, keys, "provider")
+    return dim_providers[["provider_sk"] + keys + PROVIDER_ATTRIBUTES]
 
 # def create_dim_procedures(transactions_df):
 #     dim_procedures = transactions_df[["ProcedureCode"]].drop_duplicates().copy()
@@ -29,7 +45,7 @@ def create_dim_providers(transactions_df):
 def create_dim_procedures(transactions_df: pd.DataFrame) -> pd.DataFrame:
     dim = transactions_df[["ProcedureCode"]].drop_duplicates()
     dim["ProcedureCode"] = dim["ProcedureCode"].astype(str).str.strip()
-    dim["procedure_sk"] = dim.reset_index(drop=True).index + 1
+    dim["procedure_sk"] = surrogate_keys(dim, ["ProcedureCode"], "procedure")
 
     descriptions_df = pd.read_csv("Data/cptcodes/cptcodes.csv")
     descriptions_df = descriptions_df.rename(columns={
@@ -76,7 +92,7 @@ def create_fact_transactions(transactions_df, dim_patients, dim_providers, dim_p
     fact = fact.merge(dim_patients[["unified_patient_id", "patient_sk"]], on="unified_patient_id", how="left")
 
     # Merge with dim_providers to get provider_sk
-    fact = fact.merge(dim_providers, on="ProviderID", how="left")
+    fact = fact.merge(dim_providers[["source", "ProviderID", "provider_sk"]], on=["source", "ProviderID"], how="left")
 
     # Merge with dim_procedures to get procedure_sk
     fact = fact.merge(dim_procedures, on="ProcedureCode", how="left")
@@ -86,6 +102,9 @@ def create_fact_transactions(transactions_df, dim_patients, dim_providers, dim_p
     fact = fact.merge(dim_date_renamed[["ServiceDate", "date_sk"]], on="ServiceDate", how="left")
     fact = fact.rename(columns={"date_sk": "service_date_sk"})
 
+    # Encounter attributes come from the join pushed down in extraction
+    fact["EncounterDate"] = pd.to_datetime(fact["EncounterDate"], errors="coerce")
+
     # Final selected columns (including surrogate keys and actual ServiceDate)
     return fact[[
         "TransactionID",
@@ -99,7 +118,9 @@ def create_fact_transactions(transactions_df, dim_patients, dim_providers, dim_p
         "PaidAmount",
         "ClaimID",
         "PayorID",
-        "VisitType"
+        "VisitType",
+        "EncounterType",
+        "EncounterDate"
     ]]
 
     fact = transactions_df.copy()
@@ -144,7 +165,7 @@ def create_fact_claims(claims_df, dim_patients, dim_date):
             fact.drop(columns=["date"], inplace=True)
 
     # Add claim surrogate key
-    fact.insert(0, "claim_sk", range(1, len(fact) + 1))
+    fact.insert(0, "claim_sk", surrogate_keys(fact, ["source", "ClaimID"], "claim"))
 
     return fact
 
@@ -5,6 +5,12 @@ import mysql.connector
 from sqlalchemy import create_engine
 from config.settings import MYSQL_CONFIG
 from src.logger import get_logger
+from src.source_queries import (
+    PATIENT_COLUMN_ALIASES,
+    build_patient_query,
+    build_provider_query,
+    build_transaction_query,
+)
 import os
 import time
 
@@ -12,6 +18,12 @@ logger = get_logger("DataExtractor")
 
 REQUIRED_CLAIMS_COLUMNS = {"ClaimID", "PatientID"}
 
+# Claims file -> source; ClaimIDs repeat across hospitals, so this must be exact
+CLAIMS_FILE_SOURCES = {
+    "hospital1_claim_data.csv": "hospital_a",
+    "hospital2_claim_data.csv": "hospital_b",
+}
+
 class DataExtractor:
     def __init__(self):
         self.connections = {}
@@ -29,19 +41,25 @@ class DataExtractor:
     def extract_patients(self, source_name):
         start = time.time()
         self.connect(source_name)
-        query = "SELECT * FROM patients"
-        df = pd.read_sql(query, self.connections[source_name])
+        query, params = build_patient_query(source_name)
+        df = pd.read_sql(query, self.connections[source_name], params=params)
         df["source"] = source_name
         duration = round(time.time() - start, 2)
         logger.info(f"📄 Extracted {len(df)} patients from {source_name} in {duration}s.")
         return df
 
+    def extract_providers(self, source_name):
+        self.connect(source_name)
+        query, params = build_provider_query(source_name)
+        df = pd.read_sql(query, self.connections[source_name], params=params)
+        df["source"] = source_name
+        logger.info(f"📄 Extracted {len(df)} providers from {source_name}.")
+        return df
+
     def extract_transactions(self, source_name, start_date=None, end_date=None):
         self.connect(source_name)
-        query = "SELECT * FROM transactions"
-        if start_date and end_date:
-            query += f" WHERE transaction_date BETWEEN '{start_date}' AND '{end_date}'"
-        df = pd.read_sql(query, self.connections[source_name])
+        query, params = build_transaction_query(source_name, start_date, end_date)
+        df = pd.read_sql(query, self.connections[source_name], params=params)
         df["source"] = source_name
         logger.info(f"📄 Extracted {len(df)} transactions from {source_name}.")
         return df
@@ -50,12 +68,14 @@ class DataExtractor:
         all_claims = []
         for filename in os.listdir(folder_path):
             if filename.endswith(".csv"):
+                source = CLAIMS_FILE_SOURCES.get(filename.lower())
+                if source is None:
+                    logger.warning(f"⚠️ Skipping {filename} — no source mapped for this claims file")
+                    continue
                 file_path = os.path.join(folder_path, filename)
                 try:
                     df = pd.read_csv(file_path)
                     if "PatientID" in df.columns:
-                        # Add 'source' based on filename (e.g., "claims_hospital_a.csv")
-                        source = "hospital_a" if "a" in filename.lower() else "hospital_b"
                         df["source"] = source
                         all_claims.append(df)
                         logger.info(f"✅ Loaded {len(df)} records from {filename}")
@@ -89,13 +109,10 @@ class DataExtractor:
     def standardize_patient_schema(self, df: pd.DataFrame, source: str) -> pd.DataFrame:
         logger.info(f"🧼 Standardizing patient schema for {source}")
 
-        if source == "hospital_b":
-            rename_map = {
-                "ID": "PatientID",
-                "F_Name": "FirstName",
-                "L_Name": "LastName",
-                "M_Name": "MiddleName"
-            }
+        # Aliases are already applied in SQL by build_patient_query;
+        # this only matters for frames that did not come from the database.
+        rename_map = PATIENT_COLUMN_ALIASES.get(source, {})
+        if rename_map:
             df = df.rename(columns=rename_map)
 
         required_columns = [
@@ -0,0 +1,138 @@
+# src/keys.py
+
+import hashlib
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.normalize import normalise_values
+
+logger = get_logger("KeyRegistry")
+
+# Keep keys in the positive INT64 range so they load into BigQuery as-is
+KEY_MASK = np.uint64(0x7FFFFFFFFFFFFFFF)
+NATURAL_KEY_SEPARATOR = "\x1f"
+
+
+def _hash_key(entity):
+    # hash_pandas_object expects a 16 character key; one per entity keeps key spaces apart
+    return hashlib.md5(entity.encode("utf-8")).hexdigest()[:16]
+
+
+def _natural_frame(df, columns):
+    natural = pd.DataFrame({col: normalise_values(df[col]) for col in columns}, index=df.index)
+    null_parts = natural.isna().any(axis=1)
+    if null_parts.any():
+        logger.error(f"❌ {int(null_parts.sum())} rows have a null natural key part in {columns}")
+        raise ValueError(f"Null natural key part in {columns}")
+    return natural
+
+
+def _natural_key_strings(natural):
+    return reduce(lambda a, b: a + NATURAL_KEY_SEPARATOR + b, [natural[col] for col in natural.columns])
+
+
+def _check_collisions(keys, natural_keys, entity):
+    pairs = pd.DataFrame({"key": keys, "natural_key": natural_keys}).drop_duplicates()
+    collisions = pairs[pairs["key"].duplicated(keep=False)]
+    if not collisions.empty:
+        logger.error(f"❌ {collisions['key'].nunique()} key collisions for {entity}: "
+                     f"{collisions.head(10).to_dict('records')}")
+        raise ValueError(f"Surrogate key collision detected for {entity}")
+
+
+def surrogate_keys(df, columns, entity):
+    """Derive deterministic 63-bit integer keys for `df` from its natural key `columns`.
+
+    The same natural key always maps to the same key, so partitions, processes
+    and reruns can assign keys independently. Returned as nullable Int64 so
+    left merges keep the full value instead of casting through float64.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype="Int64")
+
+    natural = _natural_frame(df, columns)
+    hashed = pd.util.hash_pandas_object(natural, index=False, hash_key=_hash_key(entity))
+    keys = pd.Series((hashed.to_numpy() & KEY_MASK).astype(np.int64), index=df.index, dtype="Int64")
+
+    _check_collisions(keys, _natural_key_strings(natural), entity)
+    return keys
+
+
+class KeyRegistry:
+    """Persisted key -> natural key mapping, one folder per entity.
+
+    Each writer (partition, process or run) writes its own segment file, so
+    registration needs no locking; collisions are checked by reading back only
+    the registered entries whose keys are being registered now.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def _entity_dir(self, entity):
+        return os.path.join(self.base_dir, entity)
+
+    def _segment_paths(self, entity):
+        entity_dir = self._entity_dir(entity)
+        if not os.path.isdir(entity_dir):
+            return []
+        return [os.path.join(entity_dir, f) for f in sorted(os.listdir(entity_dir)) if f.endswith(".parquet")]
+
+    def load(self, entity, keys=None):
+        """Registered entries for `entity`, optionally only those whose key is in `keys`."""
+        filters = None if keys is None else [("key", "in", [int(k) for k in keys])]
+        segments = [pd.read_parquet(path, filters=filters) for path in self._segment_paths(entity)]
+        if not segments:
+            return pd.DataFrame({"key": pd.Series(dtype="Int64"), "natural_key": pd.Series(dtype="string")})
+
+        registry = pd.concat(segments, ignore_index=True).drop_duplicates()
+        registry["key"] = registry["key"].astype("Int64")
+        registry["natural_key"] = registry["natural_key"].astype("string")
+        return registry
+
+    def register(self, entity, df, key_column, natural_columns, segment):
+        """Check `df`'s keys against the registry and write new ones to `segment`.
+
+        Use a segment name unique to each writer (e.g. run id plus pid or a
+        partition id) so writers never rewrite each other's files.
+        """
+        incoming = df[df[key_column].notna()]
+        incoming = pd.DataFrame({
+            "key": incoming[key_column].astype("Int64"),
+            "natural_key": _natural_key_strings(_natural_frame(incoming, natural_columns)),
+        }).drop_duplicates()
+        _check_collisions(incoming["key"], incoming["natural_key"], entity)
+
+        existing = self.load(entity, keys=incoming["key"].unique())
+        combined = pd.concat([existing, incoming], ignore_index=True)
+        _check_collisions(combined["key"], combined["natural_key"], entity)
+
+        new_entries = incoming[~incoming["key"].isin(existing["key"])]
+        if new_entries.empty:
+            logger.info(f"🔑 No new {entity} keys to register.")
+            return 0
+
+        entity_dir = self._entity_dir(entity)
+        os.makedirs(entity_dir, exist_ok=True)
+        segment_path = os.path.join(entity_dir, f"{segment}.parquet")
+        if os.path.exists(segment_path):
+            raise ValueError(f"Key registry segment already exists: {segment_path}")
+
+        tmp_path = f"{segment_path}.tmp"
+        new_entries.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, segment_path)
+
+        logger.info(f"🔑 Registered {len(new_entries)} new {entity} keys in segment '{segment}'.")
+        return len(new_entries)
+
+
+def assert_unique_keys(df, key_column, name):
+    """Fail before loading if `key_column` repeats, i.e. distinct rows share a natural key."""
+    duplicated = df[key_column].duplicated(keep=False)
+    if duplicated.any():
+        logger.error(f"❌ {int(duplicated.sum())} rows of {name} share a {key_column}: "
+                     f"{df.loc[duplicated, key_column].head(5).tolist()}")
+        raise ValueError(f"Duplicate {key_column} in {name}")
@@ -0,0 +1,17 @@
+# src/normalize.py
+
+import pandas as pd
+
+
+def normalise_values(col):
+    """String form of a column in which integral numbers match their int/str form.
+
+    Int columns upcast to float64 by a null (common in chunked reads) would
+    otherwise turn 94521 into "94521.0"; here 1, 1.0 and "1" all become "1".
+    """
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        text = col.astype("string")
+        integral = col.notna() & (col % 1 == 0)
+        text[integral] = col[integral].astype("int64").astype("string")
+        return text
+    return col.astype("string")
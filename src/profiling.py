@@ -0,0 +1,365 @@
+# src/profiling.py
+
+import base64
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.normalize import normalise_values
+
+logger = get_logger("DataProfiler")
+
+QUANTILE_COLUMNS = ["Amount", "PaidAmount", "ClaimAmount"]
+TOP_K_COLUMNS = ["PayorID", "ProcedureCode"]
+REPORTED_QUANTILES = [0.5, 0.95, 0.99]
+
+DRIFT_THRESHOLDS = {
+    "row_count": 0.5,         # relative change
+    "null_rate": 0.05,        # absolute change
+    "distinct_count": 0.2,    # relative change
+    "quantile": 0.1,          # relative change of each reported quantile
+    "top_k_overlap": 0.5,     # minimum Jaccard overlap of top-k values
+}
+
+# ----------------------
+# Sketches
+# ----------------------
+def _bit_length(x):
+    # Exact 64-bit bit_length, vectorized (float log2 rounds near powers of two)
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(shift))
+        n[big] += shift
+        x[big] >>= np.uint64(shift)
+    return n + (x > 0)
+
+
+class HyperLogLog:
+    """Distinct-count sketch; merge is an element-wise max of registers."""
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, series):
+        values = series.dropna()
+        if values.empty:
+            return
+        hashed = pd.util.hash_pandas_object(normalise_values(values), index=False).to_numpy()
+        p = self.precision
+        index = (hashed >> np.uint64(64 - p)).astype(np.int64)
+        rank = np.minimum(64 - _bit_length(hashed << np.uint64(p)) + 1, 64 - p + 1)
+        best = pd.Series(rank).groupby(index).max()
+        slots = best.index.to_numpy()
+        self.registers[slots] = np.maximum(self.registers[slots], best.to_numpy().astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {"precision": self.precision,
+                "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class TDigest:
+    """Quantile sketch using the arcsine scale function; merge re-compresses both centroid sets."""
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, series):
+        values = pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if len(other.means) == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        bucket_weights = np.bincount(bucket, weights=weights)
+        bucket_sums = np.bincount(bucket, weights=means * weights)
+        keep = bucket_weights > 0
+        self.weights = bucket_weights[keep]
+        self.means = bucket_sums[keep] / bucket_weights[keep]
+
+    def quantile(self, q):
+        if len(self.means) == 0:
+            return None
+        cumulative = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        xp = np.concatenate([[0.0], cumulative, [1.0]])
+        fp = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q, xp, fp))
+
+    def to_dict(self):
+        return {"compression": self.compression, "means": self.means.tolist(),
+                "weights": self.weights.tolist(),
+                "min": None if len(self.means) == 0 else float(self.min),
+                "max": None if len(self.means) == 0 else float(self.max)}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["compression"])
+        sketch.means = np.asarray(data["means"], dtype=np.float64)
+        sketch.weights = np.asarray(data["weights"], dtype=np.float64)
+        if data["min"] is not None:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+
+class TopK:
+    """Misra-Gries heavy hitters; counts are lower bounds and merge by summing then trimming."""
+
+    def __init__(self, k=10, capacity=None):
+        self.k = k
+        self.capacity = capacity or k * 100
+        self.counts = pd.Series(dtype="int64")
+
+    def update(self, series):
+        self._combine(normalise_values(series.dropna()).value_counts())
+
+    def merge(self, other):
+        self._combine(other.counts)
+
+    def _combine(self, counts):
+        combined = self.counts.add(counts, fill_value=0)
+        if len(combined) > self.capacity:
+            combined = combined.sort_values(ascending=False)
+            threshold = combined.iloc[self.capacity]
+            combined = combined.iloc[:self.capacity] - threshold
+            combined = combined[combined > 0]
+        self.counts = combined.astype("int64")
+
+    def top(self):
+        top = self.counts.sort_values(ascending=False).head(self.k)
+        return [[value, int(count)] for value, count in top.items()]
+
+    def to_dict(self):
+        return {"k": self.k, "capacity": self.capacity,
+                "counts": {value: int(count) for value, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"], data["capacity"])
+        sketch.counts = pd.Series(data["counts"], dtype="int64")
+        return sketch
+
+# ----------------------
+# Frame profile
+# ----------------------
+class FrameProfile:
+    """Mergeable per-column sketches for one frame, built chunk by chunk."""
+
+    def __init__(self, name):
+        self.name = name
+        self.row_count = 0
+        self.null_counts = {}
+        self.distinct = {}
+        self.quantiles = {}
+        self.top_k = {}
+
+    def update(self, chunk):
+        self.row_count += len(chunk)
+        nulls = chunk.isnull().sum()
+        for col in chunk.columns:
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(nulls[col])
+            self.distinct.setdefault(col, HyperLogLog()).update(chunk[col])
+            if col in QUANTILE_COLUMNS:
+                self.quantiles.setdefault(col, TDigest()).update(chunk[col])
+            if col in TOP_K_COLUMNS:
+                self.top_k.setdefault(col, TopK()).update(chunk[col])
+        return self
+
+    def merge(self, other):
+        """Fold in a profile of another chunk of the same frame, e.g. from a parallel worker."""
+        self.row_count += other.row_count
+        for col, count in other.null_counts.items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + count
+        for target, source, factory in [(self.distinct, other.distinct, HyperLogLog),
+                                        (self.quantiles, other.quantiles, TDigest),
+                                        (self.top_k, other.top_k, TopK)]:
+            for col, sketch in source.items():
+                target.setdefault(col, factory()).merge(sketch)
+        return self
+
+    def summary(self):
+        columns = {}
+        for col, nulls in self.null_counts.items():
+            stats = {
+                "null_count": nulls,
+                "null_rate": round(nulls / self.row_count, 6) if self.row_count else 0.0,
+                "distinct_count": self.distinct[col].count(),
+            }
+            if col in self.quantiles:
+                stats["quantiles"] = {str(q): self.quantiles[col].quantile(q) for q in REPORTED_QUANTILES}
+            if col in self.top_k:
+                stats["top_k"] = self.top_k[col].top()
+            columns[col] = stats
+        return {"name": self.name, "row_count": self.row_count, "columns": columns}
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "row_count": self.row_count,
+            "null_counts": self.null_counts,
+            "distinct": {col: s.to_dict() for col, s in self.distinct.items()},
+            "quantiles": {col: s.to_dict() for col, s in self.quantiles.items()},
+            "top_k": {col: s.to_dict() for col, s in self.top_k.items()},
+            "summary": self.summary(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data["name"])
+        profile.row_count = data["row_count"]
+        profile.null_counts = dict(data["null_counts"])
+        profile.distinct = {col: HyperLogLog.from_dict(s) for col, s in data["distinct"].items()}
+        profile.quantiles = {col: TDigest.from_dict(s) for col, s in data["quantiles"].items()}
+        profile.top_k = {col: TopK.from_dict(s) for col, s in data["top_k"].items()}
+        return profile
+
+
+def profile_frame(df, name, chunk_size=100_000):
+    """Profile a frame (or an iterable of chunks) in a single pass."""
+    profile = FrameProfile(name)
+    if isinstance(df, pd.DataFrame):
+        # Record the schema even when the frame is empty
+        profile.update(df.iloc[:0])
+        chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+    else:
+        chunks = df
+    for chunk in chunks:
+        profile.update(chunk)
+    logger.info(f"📊 Profiled {profile.row_count} rows, {len(profile.null_counts)} columns of {name}.")
+    return profile
+
+# ----------------------
+# Persistence and drift
+# ----------------------
+class ProfileStore:
+    """Stores one JSON profile per frame under <base_dir>/<run_id>/."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def save(self, run_id, profile):
+        run_dir = os.path.join(self.base_dir, run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        path = os.path.join(run_dir, f"{profile.name}.json")
+        with open(path, "w") as f:
+            json.dump(profile.to_dict(), f)
+        return path
+
+    def load_previous(self, name, run_id):
+        """Latest profile of `name` from a run older than `run_id` (run ids sort by time)."""
+        if not os.path.isdir(self.base_dir):
+            return None
+        previous_runs = sorted((r for r in os.listdir(self.base_dir) if r < run_id), reverse=True)
+        for previous_run in previous_runs:
+            path = os.path.join(self.base_dir, previous_run, f"{name}.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    return FrameProfile.from_dict(json.load(f))
+        return None
+
+
+def _relative_change(current, previous):
+    if previous is None or current is None:
+        return 0.0
+    if previous == 0:
+        # Zero to non-zero (e.g. a source recovering) always counts as drift
+        return 0.0 if current == 0 else float("inf")
+    return abs(current - previous) / abs(previous)
+
+
+def detect_drift(current, previous, thresholds=DRIFT_THRESHOLDS):
+    """Compare two profiles of the same frame and return a list of alert strings."""
+    alerts = []
+    now, before = current.summary(), previous.summary()
+
+    change = _relative_change(now["row_count"], before["row_count"])
+    if change > thresholds["row_count"]:
+        alerts.append(f"{current.name}: row count {before['row_count']} -> {now['row_count']}")
+
+    for col, stats in now["columns"].items():
+        old = before["columns"].get(col)
+        if old is None:
+            alerts.append(f"{current.name}.{col}: new column")
+            continue
+
+        if abs(stats["null_rate"] - old["null_rate"]) > thresholds["null_rate"]:
+            alerts.append(f"{current.name}.{col}: null rate {old['null_rate']:.2%} -> {stats['null_rate']:.2%}")
+
+        if _relative_change(stats["distinct_count"], old["distinct_count"]) > thresholds["distinct_count"]:
+            alerts.append(f"{current.name}.{col}: distinct count {old['distinct_count']} -> {stats['distinct_count']}")
+
+        for q, value in stats.get("quantiles", {}).items():
+            old_value = old.get("quantiles", {}).get(q)
+            if _relative_change(value, old_value) > thresholds["quantile"]:
+                alerts.append(f"{current.name}.{col}: p{float(q) * 100:g} {old_value:.2f} -> {value:.2f}")
+
+        if "top_k" in stats and "top_k" in old:
+            new_values = {value for value, _ in stats["top_k"]}
+            old_values = {value for value, _ in old["top_k"]}
+            union = new_values | old_values
+            overlap = len(new_values & old_values) / len(union) if union else 1.0
+            if overlap < thresholds["top_k_overlap"]:
+                alerts.append(f"{current.name}.{col}: top-{len(new_values)} overlap {overlap:.0%}")
+
+    for col in before["columns"]:
+        if col not in now["columns"]:
+            alerts.append(f"{current.name}.{col}: column dropped")
+
+    return alerts
+
+
+def run_profiling(frames, run_id, store):
+    """Profile each named frame, persist it for this run and check drift against the prior run."""
+    alerts = []
+    for name, df in frames.items():
+        profile = profile_frame(df, name)
+        store.save(run_id, profile)
+        previous = store.load_previous(name, run_id)
+        if previous is None:
+            logger.info(f"ℹ️ No previous profile for {name}; drift check skipped.")
+            continue
+        frame_alerts = detect_drift(profile, previous)
+        for alert in frame_alerts:
+            logger.warning(f"⚠️ Drift: {alert}")
+        alerts.extend(frame_alerts)
+    return alerts
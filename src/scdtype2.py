@@ -2,6 +2,7 @@ import pandas as pd
 from datetime import datetime
 from google.cloud import bigquery
 import pytz
+from src.keys import surrogate_keys
 
 def read_existing_dim_patients(table_id):
     client = bigquery.Client()
@@ -66,7 +67,6 @@ def apply_scd_type_2(existing_dim, new_data):
     existing_dim["expiry_date"] = pd.to_datetime(existing_dim["expiry_date"], utc=True, errors="coerce")
 
     scd_records = []
-    next_sk = existing_dim["patient_sk"].max() + 1 if not existing_dim.empty else 1
 
     for _, new_row in new_data.iterrows():
         # Match by key and is_current
@@ -80,8 +80,6 @@ def apply_scd_type_2(existing_dim, new_data):
             new_row["expiry_date"] = far_future
             new_row["is_current"] = True
             new_row["version"] = 1
-            new_row["patient_sk"] = next_sk
-            next_sk += 1
             scd_records.append(new_row)
         else:
             latest = match.iloc[0]
@@ -94,8 +92,6 @@ def apply_scd_type_2(existing_dim, new_data):
                 new_row["expiry_date"] = far_future
                 new_row["is_current"] = True
                 new_row["version"] = latest["version"] + 1
-                new_row["patient_sk"] = next_sk
-                next_sk += 1
                 scd_records.append(new_row)
 
     # Append new SCD records
@@ -105,6 +101,10 @@ def apply_scd_type_2(existing_dim, new_data):
     else:
         updated_dim = existing_dim
 
+    # One key per patient version, derived from the natural key so reruns reproduce it
+    updated_dim["version"] = pd.to_numeric(updated_dim["version"], errors="coerce").astype(int)
+    updated_dim["patient_sk"] = surrogate_keys(updated_dim, [key, "version"], "patient")
+
     # Final timezone conversion
     updated_dim["effective_date"] = pd.to_datetime(updated_dim["effective_date"], utc=True)
     updated_dim["expiry_date"] = pd.to_datetime(updated_dim["expiry_date"], utc=True)
@@ -0,0 +1,99 @@
+# src/source_queries.py
+
+# Per-source SELECT builders for the hospital MySQL databases.
+# Only the columns used by later stages are projected, hospital_b's patient
+# columns are aliased to the common schema in SQL, and the encounter and
+# provider/department lookups are joined at the source instead of in pandas.
+
+# Canonical patient columns (the "source" column is added client-side)
+PATIENT_COLUMNS = [
+    "PatientID", "FirstName", "LastName", "MiddleName",
+    "SSN", "PhoneNumber", "Gender", "DOB",
+    "Address", "ModifiedDate"
+]
+
+# Source column -> canonical column, per hospital
+PATIENT_COLUMN_ALIASES = {
+    "hospital_a": {},
+    "hospital_b": {
+        "ID": "PatientID",
+        "F_Name": "FirstName",
+        "L_Name": "LastName",
+        "M_Name": "MiddleName"
+    }
+}
+
+# Transaction columns consumed by transformation and dimensional modeling
+TRANSACTION_COLUMNS = [
+    "TransactionID", "PatientID", "ProviderID",
+    "VisitDate", "ServiceDate", "PaidDate", "VisitType",
+    "Amount", "AmountType", "PaidAmount",
+    "ClaimID", "PayorID", "ProcedureCode"
+]
+
+# Encounter attributes carried onto fact_transactions
+ENCOUNTER_COLUMNS = ["EncounterType", "EncounterDate"]
+
+# (table alias, column, output name) for the provider dimension; the
+# department is the provider's own (providers.DeptID), not a transaction's
+PROVIDER_COLUMNS = [
+    ("p", "ProviderID", "ProviderID"),
+    ("p", "FirstName", "ProviderFirstName"),
+    ("p", "LastName", "ProviderLastName"),
+    ("p", "Specialization", "Specialization"),
+    ("p", "NPI", "NPI"),
+    ("p", "DeptID", "DeptID"),
+    ("d", "Name", "DepartmentName"),
+]
+
+
+def _check_source(source_name):
+    if source_name not in PATIENT_COLUMN_ALIASES:
+        raise ValueError(f"Unknown source: {source_name}")
+
+
+def build_patient_query(source_name):
+    """Return (query, params) selecting patients in the common schema."""
+    _check_source(source_name)
+    canonical_to_source = {v: k for k, v in PATIENT_COLUMN_ALIASES[source_name].items()}
+
+    select_list = []
+    for col in PATIENT_COLUMNS:
+        source_col = canonical_to_source.get(col, col)
+        if source_col == col:
+            select_list.append(col)
+        else:
+            select_list.append(f"{source_col} AS {col}")
+
+    query = f"SELECT {', '.join(select_list)} FROM patients"
+    return query, None
+
+
+def build_provider_query(source_name):
+    """Return (query, params) selecting providers joined to their department."""
+    _check_source(source_name)
+
+    select_list = [
+        f"{alias}.{col}" if col == name else f"{alias}.{col} AS {name}"
+        for alias, col, name in PROVIDER_COLUMNS
+    ]
+    query = (f"SELECT {', '.join(select_list)} FROM providers p"
+             " LEFT JOIN departments d ON d.DeptID = p.DeptID")
+    return query, None
+
+
+def build_transaction_query(source_name, start_date=None, end_date=None):
+    """Return (query, params) selecting the transaction columns used downstream,
+    joined to their encounter."""
+    _check_source(source_name)
+
+    select_list = [f"t.{col}" for col in TRANSACTION_COLUMNS] + [f"e.{col}" for col in ENCOUNTER_COLUMNS]
+    query = (f"SELECT {', '.join(select_list)} FROM transactions t"
+             " LEFT JOIN encounters e ON e.EncounterID = t.EncounterID")
+
+    params = None
+    if start_date and end_date:
+        query += " WHERE t.ServiceDate BETWEEN %s AND %s"
+        params = (start_date, end_date)
+
+    return query, params
@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from src import keys
+from src.keys import KeyRegistry, assert_unique_keys, surrogate_keys
+
+
+def test_surrogate_keys_are_deterministic():
+    df = pd.DataFrame({"source": ["hospital_a", "hospital_b"], "ClaimID": ["CLAIM1", "CLAIM1"]})
+    first = surrogate_keys(df, ["source", "ClaimID"], "claim")
+    second = surrogate_keys(df.iloc[::-1], ["source", "ClaimID"], "claim")
+
+    assert first.dtype == "Int64"
+    assert (first >= 0).all()
+    assert first.is_unique
+    assert first.tolist() == second.iloc[::-1].tolist()
+
+
+def test_surrogate_keys_depend_on_entity():
+    df = pd.DataFrame({"ProviderID": ["PROV0001"]})
+    assert surrogate_keys(df, ["ProviderID"], "provider")[0] != surrogate_keys(df, ["ProviderID"], "procedure")[0]
+
+
+def test_surrogate_keys_normalise_integral_numbers():
+    as_int = surrogate_keys(pd.DataFrame({"code": [94521]}), ["code"], "procedure")[0]
+    as_float = surrogate_keys(pd.DataFrame({"code": [94521.0]}), ["code"], "procedure")[0]
+    as_str = surrogate_keys(pd.DataFrame({"code": ["94521"]}), ["code"], "procedure")[0]
+    assert as_int == as_float == as_str
+
+
+def test_surrogate_keys_reject_null_natural_key():
+    df = pd.DataFrame({"source": ["hospital_a", "hospital_a"], "ClaimID": ["CLAIM1", None]})
+    with pytest.raises(ValueError):
+        surrogate_keys(df, ["source", "ClaimID"], "claim")
+
+
+def test_surrogate_keys_raise_on_collision(monkeypatch):
+    # Force every key to zero so distinct natural keys collide
+    monkeypatch.setattr(keys, "KEY_MASK", keys.np.uint64(0))
+    df = pd.DataFrame({"ProviderID": ["PROV0001", "PROV0002"]})
+    with pytest.raises(ValueError):
+        surrogate_keys(df, ["ProviderID"], "provider")
+
+
+def test_assert_unique_keys():
+    assert_unique_keys(pd.DataFrame({"claim_sk": [1, 2]}), "claim_sk", "fact_claims")
+    with pytest.raises(ValueError):
+        assert_unique_keys(pd.DataFrame({"claim_sk": [1, 1]}), "claim_sk", "fact_claims")
+
+
+def test_registry_round_trip(tmp_path):
+    registry = KeyRegistry(str(tmp_path))
+    df = pd.DataFrame({"source": ["hospital_a", "hospital_b"], "ClaimID": ["CLAIM1", "CLAIM1"]})
+    df["claim_sk"] = surrogate_keys(df, ["source", "ClaimID"], "claim")
+
+    assert registry.register("claim", df, "claim_sk", ["source", "ClaimID"], segment="run1") == 2
+    assert registry.register("claim", df, "claim_sk", ["source", "ClaimID"], segment="run2") == 0
+
+    more = pd.DataFrame({"source": ["hospital_a"], "ClaimID": ["CLAIM2"]})
+    more["claim_sk"] = surrogate_keys(more, ["source", "ClaimID"], "claim")
+    assert registry.register("claim", more, "claim_sk", ["source", "ClaimID"], segment="run3") == 1
+
+    loaded = registry.load("claim")
+    assert sorted(loaded["key"].tolist()) == sorted(df["claim_sk"].tolist() + more["claim_sk"].tolist())
+    assert len(registry.load("claim", keys=more["claim_sk"])) == 1
+
+
+def test_registry_rejects_key_reused_for_other_natural_key(tmp_path):
+    registry = KeyRegistry(str(tmp_path))
+    registry.register("provider", pd.DataFrame({"ProviderID": ["PROV0001"], "provider_sk": [42]}),
+                      "provider_sk", ["ProviderID"], segment="run1")
+    with pytest.raises(ValueError):
+        registry.register("provider", pd.DataFrame({"ProviderID": ["PROV0002"], "provider_sk": [42]}),
+                          "provider_sk", ["ProviderID"], segment="run2")
+
+
+def test_dim_patients_keys_match_scd_natural_key():
+    from src.dimensional import create_dim_patients
+
+    patients = pd.DataFrame({
+        "unified_patient_id": ["hospital_a_HOSP1-000001"], "FirstName": ["Rick"], "LastName": ["Russo"],
+        "MiddleName": ["U"], "Gender": ["Female"], "DOB": ["1937-06-04"], "SSN": ["188-23-9828"],
+        "PhoneNumber": ["+1-630-829-7585"], "Address": ["Unit 0915"], "source": ["hospital_a"],
+    })
+    dim = create_dim_patients(patients)
+    expected = surrogate_keys(pd.DataFrame({"unified_patient_id": ["hospital_a_HOSP1-000001"], "version": [1]}),
+                              ["unified_patient_id", "version"], "patient")
+    assert dim["patient_sk"].tolist() == expected.tolist()
@@ -0,0 +1,131 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.profiling import (
+    FrameProfile,
+    HyperLogLog,
+    ProfileStore,
+    TDigest,
+    TopK,
+    detect_drift,
+    profile_frame,
+)
+
+
+def make_transactions(rows=20_000, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "TransactionID": [f"TRANS{i:06d}" for i in range(rows)],
+        "Amount": rng.uniform(10, 1000, rows),
+        "PayorID": rng.choice([f"PAYOR{i}" for i in range(50)], rows, p=np.r_[[0.3], [0.7 / 49] * 49]),
+        "ProcedureCode": rng.integers(10000, 10100, rows),
+        "VisitType": np.where(rng.random(rows) < 0.1, None, "Routine"),
+    })
+
+
+def split(frame, parts):
+    size = -(-len(frame) // parts)
+    return [frame.iloc[start:start + size] for start in range(0, len(frame), size)]
+
+
+def test_hyperloglog_estimate_and_merge():
+    values = pd.Series([f"id{i}" for i in range(50_000)])
+    single = HyperLogLog()
+    single.update(values)
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(values[:30_000])
+    right.update(values[20_000:])
+    left.merge(right)
+
+    assert abs(single.count() - 50_000) / 50_000 < 0.05
+    assert np.array_equal(left.registers, single.registers)
+
+
+def test_tdigest_merge_matches_single_pass():
+    values = pd.Series(np.random.default_rng(1).exponential(100, 50_000))
+    single = TDigest()
+    single.update(values)
+    merged = TDigest()
+    for chunk in split(values, 5):
+        part = TDigest()
+        part.update(chunk)
+        merged.merge(part)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values.quantile(q)
+        assert abs(single.quantile(q) - exact) / exact < 0.02
+        assert abs(merged.quantile(q) - exact) / exact < 0.02
+
+
+def test_topk_merge_finds_heavy_hitters():
+    df = make_transactions()
+    merged = TopK(k=3)
+    for chunk in split(df, 4):
+        part = TopK(k=3)
+        part.update(chunk["PayorID"])
+        merged.merge(part)
+
+    assert merged.top()[0][0] == df["PayorID"].value_counts().index[0]
+
+
+def test_frame_profile_merge_matches_single_pass():
+    df = make_transactions()
+    single = profile_frame(df, "transactions", chunk_size=3_000).summary()
+    merged = FrameProfile("transactions").update(df.iloc[:8_000]).merge(
+        FrameProfile("transactions").update(df.iloc[8_000:])
+    ).summary()
+
+    assert merged["row_count"] == single["row_count"] == len(df)
+    for col, stats in single["columns"].items():
+        assert merged["columns"][col]["null_count"] == stats["null_count"]
+        assert merged["columns"][col]["distinct_count"] == stats["distinct_count"]
+    assert single["columns"]["VisitType"]["null_count"] == df["VisitType"].isnull().sum()
+    assert "quantiles" in single["columns"]["Amount"]
+    assert "top_k" in single["columns"]["ProcedureCode"]
+
+
+def test_frame_profile_json_round_trip(tmp_path):
+    profile = profile_frame(make_transactions(), "transactions")
+    restored = FrameProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+    assert restored.summary() == profile.summary()
+
+    store = ProfileStore(str(tmp_path))
+    store.save("20260101T000000", profile)
+    assert store.load_previous("transactions", "20260102T000000").summary() == profile.summary()
+    assert store.load_previous("transactions", "20260101T000000") is None
+
+
+def test_empty_frame_keeps_schema():
+    df = make_transactions()
+    empty = profile_frame(df.iloc[:0], "transactions")
+    assert set(empty.summary()["columns"]) == set(df.columns)
+
+    alerts = detect_drift(empty, profile_frame(df, "transactions"))
+    assert not any("column dropped" in alert or "new column" in alert for alert in alerts)
+
+
+def test_drift_from_zero_is_reported():
+    df = make_transactions()
+    previous = profile_frame(df.iloc[:0], "transactions")
+    alerts = detect_drift(profile_frame(df, "transactions"), previous)
+    assert any("row count" in alert for alert in alerts)
+    assert any("TransactionID: distinct count" in alert for alert in alerts)
+
+
+def test_no_drift_against_same_data():
+    df = make_transactions()
+    assert detect_drift(profile_frame(df, "transactions"), profile_frame(df, "transactions")) == []
+
+
+def test_merge_mixes_int_and_float_chunks():
+    # An int column upcast to float64 by a null must not split values
+    profile = FrameProfile("f")
+    profile.update(pd.DataFrame({"ProcedureCode": [94521, 94521, 2]}))
+    profile.update(pd.DataFrame({"ProcedureCode": [94521.0, 3.0, np.nan]}))
+    stats = profile.summary()["columns"]["ProcedureCode"]
+
+    assert stats["distinct_count"] == 3
+    assert stats["top_k"][0] == ["94521", 3]
+    assert len(stats["top_k"]) == 3
@@ -0,0 +1,50 @@
+import pytest
+
+from src.source_queries import build_patient_query, build_provider_query, build_transaction_query
+
+
+def test_hospital_a_patients_need_no_aliases():
+    query, params = build_patient_query("hospital_a")
+    assert query.startswith("SELECT PatientID, FirstName, LastName, MiddleName,")
+    assert " AS " not in query
+    assert params is None
+
+
+def test_hospital_b_patients_are_aliased_in_sql():
+    query, _ = build_patient_query("hospital_b")
+    for alias in ["ID AS PatientID", "F_Name AS FirstName", "L_Name AS LastName", "M_Name AS MiddleName"]:
+        assert alias in query
+    assert "*" not in query
+
+
+@pytest.mark.parametrize("builder", [build_patient_query, build_provider_query, build_transaction_query])
+def test_unknown_source_is_rejected(builder):
+    with pytest.raises(ValueError):
+        builder("hospital_c")
+
+
+def test_transaction_query_projects_and_joins_encounters():
+    query, params = build_transaction_query("hospital_a")
+    assert "*" not in query
+    assert "MedicaidID" not in query and "ICDCode" not in query
+    assert "e.EncounterType" in query and "e.EncounterDate" in query
+    assert "LEFT JOIN encounters e ON e.EncounterID = t.EncounterID" in query
+    assert "WHERE" not in query
+    assert params is None
+
+
+def test_transaction_query_binds_dates_only_when_both_set():
+    query, params = build_transaction_query("hospital_b", "2024-01-01", "2024-06-30")
+    assert query.endswith("WHERE t.ServiceDate BETWEEN %s AND %s")
+    assert params == ("2024-01-01", "2024-06-30")
+
+    query, params = build_transaction_query("hospital_b", start_date="2024-01-01")
+    assert "WHERE" not in query
+    assert params is None
+
+
+def test_provider_query_joins_provider_department():
+    query, params = build_provider_query("hospital_a")
+    assert "FROM providers p LEFT JOIN departments d ON d.DeptID = p.DeptID" in query
+    assert "p.DeptID" in query and "d.Name AS DepartmentName" in query
+    assert params is None